@@ -1,23 +1,72 @@
-import datetime as dt
+import functools
 import getpass
 import json
+import os
 import shutil
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 from urllib.parse import unquote, urlparse
-import readline
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import colorama
 from colorama import Back, Fore, Style
 
+# orjson parses the workspace.json files noticeably faster, use it if available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 colorama.init()
 
+# Age in seconds at which an unmodified workspace folder is considered old. A
+# folder has to be more than 30 whole days old, i.e. at least 31 days
+OLD_FOLDER_AGE = 31 * 24 * 60 * 60
+
+# Units used by format_size, each one is 1024 times the previous
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Thread count for filesystem bound work, the threads mostly wait on syscalls
+MAX_IO_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Progress line printed while removing folders, written in a single call per folder
+REMOVAL_PROGRESS_FORMAT = (
+    f"\rRemoved \"{{name}}\" {Back.BLACK}"
+    f"{Fore.MAGENTA}({Fore.CYAN}{{current}}{Fore.MAGENTA}/{Fore.CYAN}{{total}}{Fore.MAGENTA})"
+    f"{Style.RESET_ALL} "
+)
+
+# Minimum time in seconds between flushes of the removal progress line
+PROGRESS_FLUSH_INTERVAL = 0.1
+
+# Results of the previous run, reused for workspace folders that haven't changed since
+WSS_CACHE_PATH = Path.home() / ".cache" / "vscode-wss-cleaner.json"
+
+# Default workspaceStorage locations for each supported sys.platform value
+DEFAULT_WSS_PATH_TEMPLATES = {
+    "linux": "/home/{username}/.config/Code/User/workspaceStorage/",
+    "linux2": "/home/{username}/.config/Code/User/workspaceStorage/",
+    "darwin": "/Users/{username}/Library/Application Support/Code/User/workspaceStorage/",
+    "win32": "C:/Users/{username}/AppData/Roaming/Code/User/workspaceStorage/",
+    "win64": "C:/Users/{username}/AppData/Roaming/Code/User/workspaceStorage/",
+}
+
+# Set once enablePathCompletion has configured readline
+_readline_ready = False
+
+# colorama constants used on every print, bound once to skip the attribute lookups
+FG_RESET = Fore.RESET
+BG_BLACK = Back.BLACK
+RESET_ALL = Style.RESET_ALL
+
 
 def printWithColor(
     message: str,
-    foreground_color: Fore = Fore.RESET,
-    background_color: Back = Back.BLACK,
+    foreground_color: Fore = FG_RESET,
+    background_color: Back = BG_BLACK,
     end: str = "\n",
 ):
     """Prints colored text if colorama is installed
@@ -29,14 +78,22 @@ def printWithColor(
         end (str, optional): end paramater of the print. Defaults to '\n'.
     """
 
-    print(foreground_color + background_color + message + Style.RESET_ALL, end=end)
+    print(foreground_color + background_color + message + RESET_ALL, end=end)
 
-@dataclass
+# Slots drop the per-instance __dict__, there is one Folder per workspace
+@dataclass(slots=True)
 class Folder:
     path: str
+    target_folder: str
+    mtime: float
     workspace_exists: bool
     is_old: bool
-    sizeinbytes: int
+    # Filled in by calculateFolderSizes, only when the size is actually needed
+    sizeinbytes: Optional[int] = None
+    display_name: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.display_name = os.path.basename(os.path.normpath(self.path))
 
 def format_size(size_bytes: int) -> str:
     """Converts size as bytes to human readable format
@@ -47,68 +104,84 @@ def format_size(size_bytes: int) -> str:
     Returns:
         str: Human readable size in str format
     """
-    units = ["B", "KB", "MB", "GB", "TB"]
-    size = size_bytes
-    unit_index = 0
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
-    return f"{size:.2f} {units[unit_index]}"
+    if size_bytes <= 0:
+        return f"{0:.2f} {SIZE_UNITS[0]}"
 
+    # Every unit is 2^10 times the previous one, so the bit length picks the unit
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.2f} {SIZE_UNITS[unit_index]}"
 
+
+@functools.lru_cache(maxsize=1)
 def getDefaultWSSFolderPath() -> str:
     """Returns default workspaceStorage path based on operating system that the script ran on
 
     Returns:
         str: Path of workspaceStorage folder
     """
-    username = getpass.getuser()
-
-    if sys.platform in ("linux", "linux2"):
-        return str(Path(f"/home/{username}/.config/Code/User/workspaceStorage/"))
-    elif sys.platform == "darwin":
-        return str(
-            Path(
-                f"/Users/{username}/Library/Application Support/Code/User/workspaceStorage/"
-            )
-        )
-    elif sys.platform in ("win32", "win64"):
-        return str(
-            Path(f"C:/Users/{username}/AppData/Roaming/Code/User/workspaceStorage/")
-        )
+    path_template = DEFAULT_WSS_PATH_TEMPLATES.get(sys.platform)
+    if path_template is None:
+        return ""
 
-    return ""
+    return str(Path(path_template.format(username=getpass.getuser())))
 
 
-def isValidWSSPath(path: str) -> bool:
+def isValidWSSPath(path: str) -> tuple[bool, list[os.DirEntry]]:
     """Checks if the given folder path is a valid workspaceStorage folder
 
     Args:
         path (str): Path to check
 
     Returns:
-        bool: True if given folder path is a valid workspaceStorage folder
+        tuple[bool, list[os.DirEntry]]: True if given folder path is a valid workspaceStorage folder, and the entries of the folder so they don't have to be listed again
     """
-    if not Path(path).exists() or not Path(path).is_dir():
-        return False
+    if not os.path.isdir(path):
+        return False, []
 
-    folders = [content for content in Path(path).iterdir()]
-    return all(
-        Path( Path(path) / folder / "workspace.json" ).exists()
-        for folder in folders
-    )
+    try:
+        with os.scandir(path) as iterator:
+            entries = list(iterator)
+        is_valid = all(
+            entry.is_dir()
+            and os.path.isfile(os.path.join(entry.path, "workspace.json"))
+            for entry in entries
+        )
+    except OSError:
+        return False, []
+
+    return is_valid, entries
+
+
+def enablePathCompletion():
+    """Enables filesystem autocompletion for input() if readline is available"""
+    global _readline_ready
+    if _readline_ready:
+        return
+
+    # readline is only needed when asking for a path, and isn't available on
+    # every platform, so import it here instead of at startup
+    try:
+        import readline
+    except ImportError:
+        return
+
+    readline.set_completer_delims("\t\n")
+    readline.parse_and_bind("tab: complete")
+    _readline_ready = True
 
 
-def askForValidWSSPath() -> str:
+def askForValidWSSPath() -> tuple[str, list[os.DirEntry]]:
     """Continuously asks user for a valid workspaceStorage path
 
     Returns:
-        str: A valid workspaceStorage path
+        tuple[str, list[os.DirEntry]]: A valid workspaceStorage path and its entries
     """
+    enablePathCompletion()
     while True:
         path = input("Please enter a valid workspaceStorage path: ")
-        if isValidWSSPath(path):
-            return path
+        is_valid, entries = isValidWSSPath(path)
+        if is_valid:
+            return path, entries
 
 
 def askYesNoQuestion(
@@ -128,6 +201,10 @@ def askYesNoQuestion(
         yes_patterns = ["y", "yes"]
     if no_patterns is None:
         no_patterns = ["n", "no"]
+
+    # Input is compared lowered, so lower the patterns once as well
+    yes_set = frozenset(pattern.lower() for pattern in yes_patterns)
+    no_set = frozenset(pattern.lower() for pattern in no_patterns)
     while True:
         print(questionBody, end="")
         printWithColor(" (", Fore.MAGENTA, end="")
@@ -136,9 +213,10 @@ def askYesNoQuestion(
         printWithColor("N" if not return_for_none else "n", Fore.RED, end="")
         printWithColor(")", Fore.MAGENTA, end="")
         inp = input(": ")
-        if inp.lower() in yes_patterns:
+        inp_lower = inp.lower()
+        if inp_lower in yes_set:
             return True
-        elif inp.lower() in no_patterns:
+        elif inp_lower in no_set:
             return False
 
         if not inp:
@@ -148,7 +226,7 @@ def askYesNoQuestion(
 
 
 def getSizeOfFolder(path: str) -> int:
-    """Calculates a foldersize recursively
+    """Calculates the total size of a folder and everything inside it
 
     Args:
         path (str): Path to calculate size of
@@ -158,58 +236,230 @@ def getSizeOfFolder(path: str) -> int:
     """
 
     total_size = 0
-    for full_path in Path(path).iterdir():
-        if Path(full_path).is_file():
-            total_size += Path(full_path).stat().st_size
-        elif Path(full_path).is_dir():
-            total_size += getSizeOfFolder(full_path)
+    # Walk with an explicit stack instead of recursing to skip the per-folder
+    # call overhead
+    pending = [path]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except PermissionError:
+            # Count what can be read instead of failing the whole report
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
     return total_size
 
 
-def parseWSSFolder(path: str) -> list[Folder]:
-    """Parses workspaceStorage folder
+def getPathFromURI(uri: str) -> str:
+    """Extracts the filesystem path from a workspace folder URI
+
     Args:
-        path (str): workspaceStorage path
+        uri (str): URI of the folder, usually in "file:///..." form
+
     Returns:
-        list[Folder]: List of folders
+        str: Path that the URI points to
     """
+    # Nearly every local workspace is a plain file URI, which doesn't need the
+    # full URL parser
+    if uri.startswith("file:///"):
+        path = unquote(uri[len("file://"):])
+    else:
+        path = unquote(urlparse(uri).path)
 
-    result_list: list[Folder] = []
-    for folder_path in Path(path).iterdir():
-        json_text = ""
+    # Windows paths come as "/c:/...", drop the slash in front of the drive letter
+    if sys.platform == "win32" and path[:1] == "/" and path[2:3] == ":":
+        path = path[1:]
 
-        with (folder_path / "workspace.json").open("r") as file:
-            json_text = file.read()
+    return path
 
-        data = json.loads(json_text)
 
-        if "folder" not in data:
-            continue
+def loadWSSCache() -> dict[str, dict]:
+    """Loads the results cached by the previous run
+
+    Returns:
+        dict[str, dict]: Cached folder data keyed by folder path, empty if there is no usable cache
+    """
+    try:
+        with open(WSS_CACHE_PATH, "rb") as file:
+            cache = json_loads(file.read())
+    except (OSError, ValueError):
+        return {}
+
+    return cache if isinstance(cache, dict) else {}
+
 
-        target_folder_name = Path(unquote(urlparse(data["folder"]).path))
+def isValidCacheEntry(cached: object, mtime: float) -> bool:
+    """Checks if a cache entry is well formed and still matches its folder
+
+    Args:
+        cached (object): Entry loaded from the cache file
+        mtime (float): Current modification time of the folder
+
+    Returns:
+        bool: True if the cached target folder can be used as is
+    """
+    return (
+        isinstance(cached, dict)
+        and cached.get("mtime") == mtime
+        and isinstance(cached.get("folder"), str)
+    )
+
+
+def saveWSSCache(folders: list[Folder]):
+    """Saves workspace target folders so the next run can skip unchanged workspace.json files
+
+    Args:
+        folders (list[Folder]): Parsed folders to save
+    """
+    cache = {
+        folder.path: {
+            "mtime": folder.mtime,
+            "folder": folder.target_folder,
+        }
+        for folder in folders
+    }
+
+    # Write to a temporary file first so an interrupted run can't leave a broken cache
+    tmp_path = WSS_CACHE_PATH.with_suffix(".tmp")
+    try:
+        WSS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+        os.replace(tmp_path, WSS_CACHE_PATH)
+    except OSError:
+        # The cache only speeds up the next run, failing to write it isn't fatal
+        pass
+
+
+def parseWSSSubfolder(
+    entry: os.DirEntry,
+    old_before: Optional[float] = None,
+    cache: Optional[dict[str, dict]] = None,
+    isdir_cache: Optional[dict[str, bool]] = None,
+) -> Optional[Folder]:
+    """Parses a single workspace folder inside workspaceStorage
+
+    Args:
+        entry (os.DirEntry): Directory entry of the workspace folder
+        old_before (float, optional): Folders last modified at or before this timestamp are old. Defaults to OLD_FOLDER_AGE seconds ago.
+        cache (dict[str, dict], optional): Results of the previous run. Defaults to None.
+        isdir_cache (dict[str, bool], optional): Shared results of target folder existence checks. Defaults to None.
+    Returns:
+        Optional[Folder]: Parsed folder, None if it doesn't belong to a single folder workspace
+    """
+
+    mtime = entry.stat().st_mtime
+    cached = cache.get(entry.path) if cache else None
+
+    if isValidCacheEntry(cached, mtime):
+        target_folder_name = cached["folder"]
+    else:
+        # Both json parsers decode UTF-8 bytes themselves, so skip the text layer
+        with open(os.path.join(entry.path, "workspace.json"), "rb") as file:
+            json_bytes = file.read()
+
+        # Multi-root workspaces have no "folder" key, skip them without parsing
+        if b'"folder"' not in json_bytes:
+            return None
+
+        folder_uri = json_loads(json_bytes).get("folder")
+        if not folder_uri:
+            return None
+
+        target_folder_name = getPathFromURI(folder_uri)
+
+    if old_before is None:
+        old_before = time.time() - OLD_FOLDER_AGE
+
+    # Several workspaces can point to the same folder, only stat it once
+    workspace_exists = isdir_cache.get(target_folder_name) if isdir_cache else None
+    if workspace_exists is None:
+        workspace_exists = os.path.isdir(target_folder_name)
+        if isdir_cache is not None:
+            isdir_cache[target_folder_name] = workspace_exists
+
+    return Folder(
+        path=entry.path,
+        target_folder=target_folder_name,
+        mtime=mtime,
+        workspace_exists=workspace_exists,
+        is_old=mtime <= old_before,
+    )
 
-        # Consider a folder "old" if it isn't modified in the last 30 days
-        last_modified = dt.datetime.fromtimestamp(Path(folder_path).stat().st_mtime)
-        now = dt.datetime.now()
-        delta = now - last_modified
-        is_old = delta.days > 30
 
-        result_list.append(
-            Folder(
-                path=str(folder_path),
-                workspace_exists=target_folder_name.is_dir(),
-                is_old=is_old,
-                sizeinbytes=getSizeOfFolder(str(folder_path)),
+def getSizesOfFolders(paths: list[str]) -> list[int]:
+    """Calculates the sizes of several folders concurrently
+
+    Args:
+        paths (list[str]): Paths of the folders
+
+    Returns:
+        list[int]: Size of each folder in bytes, in the same order as paths
+    """
+    if not paths:
+        return []
+
+    # Size walks are independent and mostly wait on scandir/stat, which release the GIL
+    with ThreadPoolExecutor(max_workers=min(MAX_IO_WORKERS, len(paths))) as executor:
+        return list(executor.map(getSizeOfFolder, paths))
+
+
+def calculateFolderSizes(folders: list[Folder]):
+    """Fills in the sizes of the folders whose size isn't known yet, concurrently
+
+    Args:
+        folders (list[Folder]): Folders to calculate sizes of
+    """
+    missing = [folder for folder in folders if folder.sizeinbytes is None]
+    for folder, size in zip(missing, getSizesOfFolders([x.path for x in missing])):
+        folder.sizeinbytes = size
+
+
+def parseWSSFolder(
+    path: str, entries: Optional[list[os.DirEntry]] = None
+) -> list[Folder]:
+    """Parses workspaceStorage folder
+    Args:
+        path (str): workspaceStorage path
+        entries (list[os.DirEntry], optional): Entries of the folder if they are already listed. Defaults to None.
+    Returns:
+        list[Folder]: List of folders
+    """
+
+    if entries is None:
+        with os.scandir(path) as iterator:
+            entries = list(iterator)
+
+    cache = loadWSSCache()
+    # Consider a folder "old" if it hasn't been modified for more than 30 days
+    old_before = time.time() - OLD_FOLDER_AGE
+    isdir_cache: dict[str, bool] = {}
+
+    # Workspace folders are independent and parsing them is mostly waiting on
+    # the filesystem, so stat them concurrently to hide the syscall latency
+    with ThreadPoolExecutor(max_workers=MAX_IO_WORKERS) as executor:
+        result_list: list[Folder] = [
+            folder
+            for folder in executor.map(
+                functools.partial(
+                    parseWSSSubfolder,
+                    old_before=old_before,
+                    cache=cache,
+                    isdir_cache=isdir_cache,
+                ),
+                entries,
             )
-        )
+            if folder is not None
+        ]
 
     return result_list
 
 def main():
-    # Enable filesystem autocompletion
-    readline.set_completer_delims('\t\n')
-    readline.parse_and_bind('tab: complete')
-    
     printWithColor("Looking for workspaceFolder path...", Fore.BLUE)
     wss_path = getDefaultWSSFolderPath()
 
@@ -217,32 +467,43 @@ def main():
         printWithColor("This OS is not supported.", Fore.RED)
         return
 
-    if not isValidWSSPath(wss_path):
+    is_valid, entries = isValidWSSPath(wss_path)
+    if not is_valid:
         printWithColor("Script couldn't find workspaceStorage folder.", Fore.YELLOW)
-        askForValidWSSPath()
+        wss_path, entries = askForValidWSSPath()
     else:
         printWithColor(f"Found workspaceStorage folder in {wss_path}", Fore.GREEN)
         if askYesNoQuestion("Do you want to provide an alternative path?"):
-            askForValidWSSPath()
+            wss_path, entries = askForValidWSSPath()
 
-    folders = parseWSSFolder(wss_path)
+    folders = parseWSSFolder(wss_path, entries)
     # Mark old and/or unused workspaces as unwanted
     unwanted_folders = [x for x in folders if x.is_old or not x.workspace_exists]
+    calculateFolderSizes(unwanted_folders)
     unwanted_size = sum(x.sizeinbytes for x in unwanted_folders)
     unwanted_size_formatted = format_size(unwanted_size)
-    total_size = getSizeOfFolder(wss_path)
-    total_size_formatted = format_size(total_size)
 
     if not unwanted_folders:
+        saveWSSCache(folders)
         printWithColor("No unwanted workspaceStorage folder found!", Fore.GREEN)
         return
 
+    # Sizes are calculated lazily, so only walk the kept folders when the
+    # report actually needs the total
+    calculateFolderSizes(folders)
+    total_size = sum(x.sizeinbytes for x in folders)
+    # Multi-root workspace folders aren't parsed but still take up space
+    parsed_paths = {x.path for x in folders}
+    total_size += sum(
+        getSizesOfFolders([x.path for x in entries if x.path not in parsed_paths])
+    )
     percentage = round(100 * unwanted_size / total_size, 2)
+    unwanted_count = len(unwanted_folders)
 
     printWithColor("Found ", end="")
-    printWithColor(str(len(unwanted_folders)), Fore.CYAN, end="")
+    printWithColor(str(unwanted_count), Fore.CYAN, end="")
     printWithColor(
-        f" folder{'s' if len(unwanted_folders) > 1 else ''} with total size of ", end=""
+        f" folder{'s' if unwanted_count > 1 else ''} with total size of ", end=""
     )
     printWithColor(unwanted_size_formatted, Fore.CYAN, end="")
     printWithColor(f". ({Fore.CYAN}{percentage}%{Fore.RESET} of total)")
@@ -250,19 +511,30 @@ def main():
     if askYesNoQuestion(
         f"Do you want to clear {Fore.CYAN}ALL{Fore.RESET} unwanted folders?"
     ):
+        # Every unwanted folder is an independent subtree, so remove them
+        # concurrently and report progress as each removal finishes
+        executor = ThreadPoolExecutor(max_workers=min(MAX_IO_WORKERS, unwanted_count))
+        futures = {}
         try:
-            for (i, folder) in enumerate(unwanted_folders):
-                print(
-                    f"\rRemoving \"{Path(folder.path).name}\" ",
-                    end="",
+            futures = {
+                executor.submit(shutil.rmtree, folder.path): folder
+                for folder in unwanted_folders
+            }
+            last_flush = time.monotonic()
+            for (i, future) in enumerate(as_completed(futures)):
+                future.result()
+                sys.stdout.write(
+                    REMOVAL_PROGRESS_FORMAT.format(
+                        name=futures[future].display_name,
+                        current=i + 1,
+                        total=unwanted_count,
+                    )
                 )
-                printWithColor("(", Fore.MAGENTA, end="")
-                printWithColor(str(i + 1), Fore.CYAN, end="")
-                printWithColor("/", Fore.MAGENTA, end="")
-                printWithColor(str(len(unwanted_folders)), Fore.CYAN, end="")
-                printWithColor(")", Fore.MAGENTA, end=" ")
-                shutil.rmtree(folder.path)
-            print()
+                # Only flush a few times per second, the line is overwritten anyway
+                if time.monotonic() - last_flush >= PROGRESS_FLUSH_INTERVAL:
+                    sys.stdout.flush()
+                    last_flush = time.monotonic()
+            print(flush=True)
             printWithColor("Successfully cleared all unused folders!", Fore.GREEN)
         except KeyboardInterrupt:
             printWithColor("Got KeyboardInterrupt. Aborting...", Fore.RED)
@@ -271,8 +543,17 @@ def main():
                 f"Caught an exception while removing folders: {e}. Aborting..."
             )
         finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Don't keep cache entries for the folders that are gone now
+            removed_paths = {
+                folder.path
+                for future, folder in futures.items()
+                if not future.cancelled() and future.exception() is None
+            }
+            saveWSSCache([x for x in folders if x.path not in removed_paths])
             return
     else:
+        saveWSSCache(folders)
         printWithColor("Aborting...", Fore.RED)
 
 